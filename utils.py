@@ -11,6 +11,9 @@ Fonctions:
     - calculate_intensity_stats: Calcule les statistiques d'intensité
 """
 
+import weakref
+from dataclasses import dataclass
+
 import itk
 import vtk
 import numpy as np
@@ -18,14 +21,78 @@ from vtk.util import numpy_support
 
 import numpy as np
 import scipy.ndimage as ndi
+from scipy.signal import fftconvolve
 from scipy.ndimage import (
-    binary_opening,
-    binary_closing,
-    gaussian_filter,
     label,
     binary_fill_holes
 )
 
+# CuPy est optionnel : utilisé uniquement si un GPU est disponible
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+# cc3d (connected-components-3d) est optionnel : étiquetage 3D plus rapide
+try:
+    import cc3d
+except ImportError:
+    cc3d = None
+
+# Numba est optionnel : statistiques parallèles (moments en deux passes, histogramme)
+try:
+    import numba
+    from numba import prange
+except ImportError:
+    numba = None
+    prange = range
+
+# Au-delà de ce sigma, le lissage par FFT est plus rapide que le filtre direct
+_FFT_SMOOTHING_SIGMA = 8.0
+
+# Nombre de bins des histogrammes utilisés pour les percentiles
+_HISTOGRAM_BINS = 65536
+
+# Résumés statistiques mémorisés par volume : id(volume) -> (weakref, résumé)
+_summary_cache = {}
+
+
+@dataclass(slots=True)
+class VolStats:
+    """Statistiques d'intensité d'un volume."""
+    mn: float
+    mx: float
+    mean: float
+    std: float
+    p1: float
+    p99: float
+
+
+@dataclass(slots=True)
+class IntensityStats:
+    """
+    Statistiques retournées par calculate_intensity_stats.
+    
+    Les niveaux combinés et window/level ne sont renseignés que si un
+    deuxième volume est fourni.
+    """
+    volume1: VolStats
+    volume2: VolStats | None = None
+    min_intensity: float | None = None
+    max_intensity: float | None = None
+    window: float | None = None
+    level: float | None = None
+
+
+def _gpu_available():
+    """Indique si CuPy est installé et qu'un GPU CUDA est utilisable."""
+    if cp is None:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
+
 def postprocess_segmentation(mask: np.ndarray,
                               min_size: int = 100,
                               apply_smoothing: bool = True,
@@ -49,26 +116,136 @@ def postprocess_segmentation(mask: np.ndarray,
     mask = binary_fill_holes(mask).astype(np.uint8)
 
     # Morphologie : ouverture (nettoyage bruit), puis fermeture (remplit petits trous)
-    mask = binary_opening(mask, structure=np.ones((3, 3, 3))).astype(np.uint8)
-    mask = binary_closing(mask, structure=np.ones((3, 3, 3))).astype(np.uint8)
+    # (élément structurant 3x3x3 plein, sur masque compacté 8 voxels/octet)
+    packed = np.packbits(mask, axis=-1)
+    tail = np.uint8((0xFF << (-mask.shape[-1] % 8)) & 0xFF)
+    packed = _dilate3d_packed(_erode3d_packed(packed), tail)
+    packed = _erode3d_packed(_dilate3d_packed(packed, tail))
+    mask = np.unpackbits(packed, axis=-1, count=mask.shape[-1])
 
     # Supprimer les petits objets
-    labeled, num = label(mask)
-    sizes = np.bincount(labeled.ravel())
+    # (connectivité 6, comme la structure par défaut de scipy.ndimage.label)
+    if cc3d is not None:
+        labeled = cc3d.connected_components(mask, connectivity=6)
+        sizes = cc3d.statistics(labeled)['voxel_counts']
+    else:
+        labeled, num = label(mask)
+        sizes = np.bincount(labeled.ravel())
     sizes[0] = 0  # ignorer le fond
-    mask_clean = np.zeros_like(mask)
 
-    for i, size in enumerate(sizes):
-        if size >= min_size:
-            mask_clean[labeled == i] = 1
+    # Table de correspondance étiquette -> conservée, appliquée en une passe
+    keep = sizes >= min_size
+    mask_clean = keep[labeled].view(np.uint8)
 
     # Lissage optionnel des contours
     if apply_smoothing:
-        smoothed = gaussian_filter(mask_clean.astype(np.float32), sigma=smoothing_sigma)
-        mask_clean = (smoothed > 0.5).astype(np.uint8)
+        if smoothing_sigma > _FFT_SMOOTHING_SIGMA:
+            # Grand sigma : la convolution FFT (O(N log N)) bat le filtre direct
+            buf = _fft_gaussian(mask_clean, smoothing_sigma)
+        else:
+            # Gaussien séparable : 3 passes 1D alternant entre deux buffers float32
+            # (la première lit directement le masque uint8, sans copie float32)
+            buf = np.empty(mask_clean.shape, dtype=np.float32)
+            out = np.empty_like(buf)
+            ndi.gaussian_filter1d(mask_clean, smoothing_sigma, axis=0, output=buf)
+            ndi.gaussian_filter1d(buf, smoothing_sigma, axis=1, output=out)
+            ndi.gaussian_filter1d(out, smoothing_sigma, axis=2, output=buf)
+        mask_clean = (buf > 0.5).view(np.uint8)
 
     return mask_clean
 
+def _gaussian_kernel_1d(sigma, truncate=4.0):
+    """Noyau gaussien 1D normalisé, de même rayon que ndi.gaussian_filter1d."""
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    k = np.exp(-0.5 * (x / sigma) ** 2)
+    return (k / k.sum()).astype(np.float32)
+
+
+def _fft_gaussian(volume, sigma):
+    """
+    Lissage gaussien 3D par convolutions FFT séparables (cuFFT via CuPy si
+    un GPU est présent), en O(N log N) par axe quel que soit sigma.
+    
+    Le padding 'symmetric' reproduit le mode 'reflect' de ndi.gaussian_filter.
+    """
+    if _gpu_available():
+        from cupyx.scipy.signal import fftconvolve as xp_fftconvolve
+        xp = cp
+    else:
+        xp_fftconvolve = fftconvolve
+        xp = np
+    
+    kernel = xp.asarray(_gaussian_kernel_1d(sigma))
+    radius = kernel.size // 2
+    out = xp.asarray(volume, dtype=xp.float32)
+    
+    for axis in range(out.ndim):
+        pad_width = [(0, 0)] * out.ndim
+        pad_width[axis] = (radius, radius)
+        shape = [1] * out.ndim
+        shape[axis] = kernel.size
+        padded = xp.pad(out, pad_width, mode='symmetric')
+        out = xp_fftconvolve(padded, kernel.reshape(shape), mode='valid', axes=axis)
+    
+    return cp.asnumpy(out) if xp is not np else out
+
+
+def _morph_axis_packed(packed, axis, erode):
+    """
+    Érosion ou dilatation binaire de taille 3 le long d'un axe, sur un masque
+    compacté par np.packbits le long de X (8 voxels par octet).
+    
+    Les voisins hors du volume valent 0, comme le border_value par défaut
+    de scipy.ndimage.
+    """
+    combine = np.bitwise_and if erode else np.bitwise_or
+    
+    if axis == packed.ndim - 1:
+        # Axe X : décalage d'un bit avec retenue depuis l'octet voisin
+        prev = packed >> 1
+        prev[..., 1:] |= packed[..., :-1] << 7
+        nxt = packed << 1
+        nxt[..., :-1] |= packed[..., 1:] >> 7
+        out = combine(packed, prev, out=prev)
+        return combine(out, nxt, out=out)
+    
+    def sl(start, stop):
+        index = [slice(None)] * packed.ndim
+        index[axis] = slice(start, stop)
+        return tuple(index)
+    
+    if erode:
+        out = np.zeros_like(packed)
+        np.bitwise_and(packed[sl(None, -2)], packed[sl(1, -1)], out=out[sl(1, -1)])
+        out[sl(1, -1)] &= packed[sl(2, None)]
+    else:
+        out = packed.copy()
+        out[sl(1, None)] |= packed[sl(None, -1)]
+        out[sl(None, -1)] |= packed[sl(1, None)]
+    return out
+
+
+def _erode3d_packed(packed):
+    """Érosion 3x3x3 (séparable) d'un masque compacté."""
+    for axis in range(packed.ndim):
+        packed = _morph_axis_packed(packed, axis, erode=True)
+    return packed
+
+
+def _dilate3d_packed(packed, tail):
+    """
+    Dilatation 3x3x3 (séparable) d'un masque compacté.
+    
+    tail masque les bits de bourrage du dernier octet de chaque ligne,
+    que la dilatation en X pourrait sinon mettre à 1.
+    """
+    for axis in range(packed.ndim):
+        packed = _morph_axis_packed(packed, axis, erode=False)
+    packed[..., -1] &= tail
+    return packed
+
+
 def region_growing_segmentation(itk_image, seed: tuple[int, int, int], multiplier=2.5, iterations=5) -> np.ndarray:
     """
     Segmentation par croissance de région (ITK.ConfidenceConnected).
@@ -103,7 +280,9 @@ def preprocess_volume(volume: np.ndarray, normalize: bool = True, apply_smoothin
     # Conversion en float32 pour compatibilité avec ITK, segmentation, etc.
     volume = volume.astype(np.float32)
 
-    # Suppression des valeurs aberrantes (clipping à 1e et 99e percentile)
+    # Suppression des valeurs aberrantes (clipping à 1e et 99e percentile).
+    # Percentiles exacts : un voxel aberrant élargit les bins d'histogramme de
+    # volume_percentiles, réservé aux niveaux d'affichage
     p1, p99 = np.percentile(volume, [1, 99])
     volume = np.clip(volume, p1, p99)
 
@@ -117,11 +296,44 @@ def preprocess_volume(volume: np.ndarray, normalize: bool = True, apply_smoothin
 
     # Floutage optionnel (gaussien isotrope sigma=1)
     if apply_smoothing:
-        volume = ndi.gaussian_filter(volume, sigma=1)
+        volume = gaussian_tiled(volume, sigma=1)
 
     return volume
 
 
+def gaussian_tiled(volume: np.ndarray, sigma: float, slab: int = 16, truncate: float = 4.0) -> np.ndarray:
+    """
+    Filtre gaussien 3D appliqué par tranches de Z pour rester en cache.
+    
+    Chaque tranche (plus un halo de la taille du noyau en Z) subit les trois
+    passes 1D avant de passer à la suivante, au lieu de trois passes sur
+    tout le volume. Le résultat est identique à ndi.gaussian_filter.
+    
+    Args:
+        volume (np.ndarray): Volume 3D, shape (Z, Y, X)
+        sigma (float): Écart-type du noyau gaussien (isotrope)
+        slab (int): Nombre de coupes Z traitées à la fois
+        truncate (float): Troncature du noyau, en nombre de sigma
+        
+    Returns:
+        np.ndarray: Volume filtré (même shape)
+    """
+    halo = int(truncate * sigma + 0.5)  # rayon du noyau de gaussian_filter1d
+    out = np.empty(volume.shape, dtype=np.result_type(volume.dtype, np.float32))
+    n_z = volume.shape[0]
+    
+    for z0 in range(0, n_z, slab):
+        z1 = min(z0 + slab, n_z)
+        lo, hi = max(z0 - halo, 0), min(z1 + halo, n_z)
+        
+        tmp = ndi.gaussian_filter1d(volume[lo:hi], sigma, axis=0, output=out.dtype, truncate=truncate)
+        tmp = tmp[z0 - lo:z1 - lo]
+        ndi.gaussian_filter1d(tmp, sigma, axis=1, output=tmp, truncate=truncate)
+        ndi.gaussian_filter1d(tmp, sigma, axis=2, output=out[z0:z1], truncate=truncate)
+    
+    return out
+
+
 def automatic_segmentation(image1_np, image2_np, image1_itk, image2_itk):
     """
     Effectue une segmentation automatique d'une image en utilisant un seuil.
@@ -208,7 +420,10 @@ def vtk_to_numpy_image(vtk_image):
             return np_image
 
 def numpy_to_itk_image(array, spacing=(1.0, 1.0, 1.0)):
-    image = itk.image_from_array(array.astype(np.float32))
+    # Vue ITK sur un buffer float32 contigu : aucune copie si l'array l'est
+    # déjà (volumes chargés par ITK, sorties de preprocess_volume)
+    buffer = np.ascontiguousarray(array, dtype=np.float32)
+    image = itk.image_view_from_array(buffer)
     image.SetSpacing(spacing)
     return image
 
@@ -220,12 +435,15 @@ def debug_array_info(array, name="Array"):
         array (numpy.ndarray): Array à analyser
         name (str): Nom descriptif pour l'affichage
     """
+    # Un seul appel (deux passes sur les données) pour toutes les statistiques
+    mn, mx, mean, std, _, nonzeros = _volume_moments(array)
+    
     print(f"\n=== {name} ===")
     print(f"Shape: {array.shape}")
     print(f"Dtype: {array.dtype}")
-    print(f"Min: {array.min():.2f}, Max: {array.max():.2f}")
-    print(f"Mean: {array.mean():.2f}, Std: {array.std():.2f}")
-    print(f"Non-zero count: {np.count_nonzero(array)}/{array.size}")
+    print(f"Min: {mn:.2f}, Max: {mx:.2f}")
+    print(f"Mean: {mean:.2f}, Std: {std:.2f}")
+    print(f"Non-zero count: {nonzeros}/{array.size}")
     
     # Informations additionnelles pour les volumes 3D
     if len(array.shape) == 3:
@@ -259,72 +477,335 @@ def validate_volume_shape(volume, expected_dims=3):
                         f"mais a {len(volume.shape)} dimensions")
     
     if expected_dims == 3:
-        if any(dim <= 0 for dim in volume.shape):
-            raise ValueError("Toutes les dimensions doivent être positives")
-            
+        # Les dimensions NumPy sont >= 0 : une dimension nulle <=> volume vide
         if volume.size == 0:
-            raise ValueError("Le volume ne peut pas être vide")
+            raise ValueError("Toutes les dimensions doivent être positives")
     
     return True
 
 
+def _moments_kernel(flat, n_chunks):
+    """
+    Min, max, moyenne, somme des carrés des écarts à la moyenne, nb de
+    valeurs > 0 et != 0.
+    
+    Deux passes : les carrés sont accumulés autour de la moyenne de la
+    première passe (avec correction du résidu), ce qui évite l'annulation
+    catastrophique de Σv² - n·m² sur des données à fort décalage.
+    """
+    n = flat.size
+    mins = np.empty(n_chunks)
+    maxs = np.empty(n_chunks)
+    sums = np.zeros(n_chunks)
+    positives = np.zeros(n_chunks, dtype=np.int64)
+    nonzeros = np.zeros(n_chunks, dtype=np.int64)
+    
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        mn = np.inf
+        mx = -np.inf
+        s = 0.0
+        pos = 0
+        nz = 0
+        for i in range(start, stop):
+            v = float(flat[i])
+            mn = min(mn, v)
+            mx = max(mx, v)
+            s += v
+            if v > 0:
+                pos += 1
+            if v != 0:
+                nz += 1
+        mins[c] = mn
+        maxs[c] = mx
+        sums[c] = s
+        positives[c] = pos
+        nonzeros[c] = nz
+    
+    mean = sums.sum() / n if n > 0 else 0.0
+    
+    deviations = np.zeros(n_chunks)
+    sqdeviations = np.zeros(n_chunks)
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        sd = 0.0
+        ssd = 0.0
+        for i in range(start, stop):
+            d = float(flat[i]) - mean
+            sd += d
+            ssd += d * d
+        deviations[c] = sd
+        sqdeviations[c] = ssd
+    
+    sd = deviations.sum()
+    m2 = sqdeviations.sum() - sd * sd / n if n > 0 else 0.0
+    return mins.min(), maxs.max(), mean, m2, positives.sum(), nonzeros.sum()
+
+
+def _histogram_kernel(flat, lo, hi, n_bins, n_chunks):
+    """Histogramme à bins réguliers sur [lo, hi], via un histogramme local par thread."""
+    n = flat.size
+    local = np.zeros((n_chunks, n_bins), dtype=np.int64)
+    scale = n_bins / (hi - lo)
+    
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        for i in range(start, stop):
+            b = int((float(flat[i]) - lo) * scale)
+            local[c, min(max(b, 0), n_bins - 1)] += 1
+    
+    return local.sum(axis=0)
+
+
+def _compare_kernel(a, b, n_chunks):
+    """
+    Métriques de comparaison de deux volumes : moyennes, sommes centrées
+    Σ(a-ma)², Σ(b-mb)², Σ(a-ma)(b-mb), somme et maximum de |b - a|.
+    
+    Deux passes : les produits sont accumulés autour des moyennes de la
+    première passe (avec correction du résidu), ce qui évite l'annulation
+    catastrophique de n·Σab - Σa·Σb sur des données à fort décalage.
+    """
+    n = a.size
+    partial = np.zeros((n_chunks, 3))
+    maxs = np.zeros(n_chunks)
+    
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        sa = 0.0
+        sb = 0.0
+        sad = 0.0
+        mad = 0.0
+        for i in range(start, stop):
+            x = float(a[i])
+            y = float(b[i])
+            d = abs(y - x)
+            sa += x
+            sb += y
+            sad += d
+            mad = max(mad, d)
+        partial[c, 0] = sa
+        partial[c, 1] = sb
+        partial[c, 2] = sad
+        maxs[c] = mad
+    
+    totals = partial.sum(axis=0)
+    mean_a = totals[0] / n
+    mean_b = totals[1] / n
+    
+    centered = np.zeros((n_chunks, 5))
+    for c in prange(n_chunks):
+        start = c * n // n_chunks
+        stop = (c + 1) * n // n_chunks
+        sx = 0.0
+        sy = 0.0
+        sxx = 0.0
+        syy = 0.0
+        sxy = 0.0
+        for i in range(start, stop):
+            x = float(a[i]) - mean_a
+            y = float(b[i]) - mean_b
+            sx += x
+            sy += y
+            sxx += x * x
+            syy += y * y
+            sxy += x * y
+        centered[c, 0] = sx
+        centered[c, 1] = sy
+        centered[c, 2] = sxx
+        centered[c, 3] = syy
+        centered[c, 4] = sxy
+    
+    sx, sy, sxx, syy, sxy = centered.sum(axis=0)
+    return (mean_a, mean_b, sxx - sx * sx / n, syy - sy * sy / n, sxy - sx * sy / n,
+            totals[2], maxs.max())
+
+
+if numba is not None:
+    # Pas de fastmath pour les réductions flottantes : il autorise des
+    # réassociations qui dégradent la précision des moments et corrélations
+    _moments_kernel = numba.njit(parallel=True, cache=True)(_moments_kernel)
+    _histogram_kernel = numba.njit(parallel=True, fastmath=True, cache=True)(_histogram_kernel)
+    _compare_kernel = numba.njit(parallel=True, cache=True)(_compare_kernel)
+
+
+def _numeric_view(volume):
+    """Vue uint8 des volumes booléens, que les noyaux numba ne convertissent pas en float."""
+    return volume.view(np.uint8) if volume.dtype == np.bool_ else volume
+
+
+def _volume_moments(volume):
+    """
+    Statistiques de base d'un volume.
+    
+    Returns:
+        tuple: (min, max, moyenne, écart-type, nb de voxels > 0, nb de voxels != 0)
+    """
+    volume = _numeric_view(volume)
+    if numba is None:
+        return (float(volume.min()), float(volume.max()), float(volume.mean()),
+                float(volume.std()), int(np.count_nonzero(volume > 0)),
+                int(np.count_nonzero(volume)))
+    
+    mn, mx, mean, m2, positives, nonzeros = _moments_kernel(np.ravel(volume), numba.get_num_threads())
+    std = np.sqrt(max(m2 / volume.size, 0.0))
+    return float(mn), float(mx), float(mean), float(std), int(positives), int(nonzeros)
+
+
+def _volume_histogram(volume, lo, hi, n_bins=_HISTOGRAM_BINS):
+    """Histogramme de n_bins bins réguliers sur [lo, hi] (lo < hi)."""
+    volume = _numeric_view(volume)
+    if numba is None:
+        return np.histogram(volume, bins=n_bins, range=(lo, hi))[0]
+    return _histogram_kernel(np.ravel(volume), lo, hi, n_bins, numba.get_num_threads())
+
+
+def _histogram_quantiles(counts, lo, hi, ranks):
+    """
+    Valeurs approchées aux rangs donnés (0-indexés dans l'ordre trié),
+    par interpolation linéaire à l'intérieur du bin correspondant.
+    """
+    if hi <= lo:
+        return [float(lo) for _ in ranks]
+    
+    cdf = np.cumsum(counts)
+    width = (hi - lo) / counts.size
+    values = []
+    for rank in ranks:
+        i = min(int(np.searchsorted(cdf, rank, side='right')), counts.size - 1)
+        before = cdf[i - 1] if i > 0 else 0
+        frac = (rank - before) / counts[i] if counts[i] else 0.0
+        values.append(float(lo + width * (i + frac)))
+    return values
+
+
+def _rebin_histogram(counts, lo, hi, new_lo, new_hi, n_bins=_HISTOGRAM_BINS):
+    """
+    Ré-échantillonne un histogramme de [lo, hi] vers n_bins bins sur
+    [new_lo, new_hi] (plage englobante), par interpolation de la CDF.
+    """
+    if hi <= lo:
+        rebinned = np.zeros(n_bins)
+        i = int((lo - new_lo) / (new_hi - new_lo) * n_bins)
+        rebinned[min(max(i, 0), n_bins - 1)] = counts.sum()
+        return rebinned
+    
+    edges = np.linspace(lo, hi, counts.size + 1)
+    cdf = np.concatenate([[0], np.cumsum(counts)])
+    return np.diff(np.interp(np.linspace(new_lo, new_hi, n_bins + 1), edges, cdf))
+
+
+def _volume_summary(volume):
+    """
+    Moments et histogramme (sur [min, max]) d'un volume, mémorisés par objet.
+    
+    L'entrée du cache disparaît avec le volume ; une modification en place
+    du volume n'est en revanche pas détectée.
+    
+    Returns:
+        dict: min, max, mean, std, positives (nb de voxels > 0), histogram
+    """
+    key = id(volume)
+    entry = _summary_cache.get(key)
+    if entry is not None and entry[0]() is volume:
+        return entry[1]
+    
+    mn, mx, mean, std, positives, _ = _volume_moments(volume)
+    summary = {
+        'min': mn,
+        'max': mx,
+        'mean': mean,
+        'std': std,
+        'positives': positives,
+        'histogram': _volume_histogram(volume, mn, mx) if mx > mn else np.array([volume.size])
+    }
+    
+    try:
+        ref = weakref.ref(volume, lambda _, key=key: _summary_cache.pop(key, None))
+    except TypeError:
+        return summary
+    _summary_cache[key] = (ref, summary)
+    return summary
+
+
+def volume_percentiles(volume, percentiles):
+    """
+    Percentiles approchés d'un volume, lus sur l'histogramme de 65536 bins
+    de son résumé (une passe O(N), sans tri ni copie des données).
+    
+    Args:
+        volume (numpy.ndarray): Volume à analyser
+        percentiles (list): Percentiles souhaités, entre 0 et 100
+        
+    Returns:
+        list: Valeurs correspondantes (erreur inférieure à la largeur d'un bin)
+    """
+    summary = _volume_summary(volume)
+    ranks = [p / 100 * (volume.size - 1) for p in percentiles]
+    return _histogram_quantiles(summary['histogram'], summary['min'], summary['max'], ranks)
+
+
 def calculate_intensity_stats(volume1, volume2=None):
     """
     Calcule les statistiques d'intensité pour un ou deux volumes.
     
+    Les percentiles sont estimés à partir d'un histogramme de 65536 bins
+    (erreur inférieure à la largeur d'un bin) plutôt que par un tri complet.
+    Les résumés par volume sont mémorisés : appeler de nouveau la fonction
+    sur le même array ne reparcourt pas les données.
+    
     Args:
         volume1 (numpy.ndarray): Premier volume
         volume2 (numpy.ndarray, optional): Deuxième volume pour comparaison
         
     Returns:
-        dict: Dictionnaire contenant les statistiques calculées
-    """
-    stats = {}
-    
-    # Statistiques pour le volume 1
-    stats['volume1'] = {
-        'min': float(volume1.min()),
-        'max': float(volume1.max()),
-        'mean': float(volume1.mean()),
-        'std': float(volume1.std()),
-        'percentile_1': float(np.percentile(volume1, 1)),
-        'percentile_99': float(np.percentile(volume1, 99))
-    }
+        IntensityStats: Statistiques par volume et niveaux d'affichage
+    """
+    volumes = {'volume1': volume1}
+    if volume2 is not None:
+        volumes['volume2'] = volume2
+    
+    # Deux passes de moments + une passe d'histogramme par volume (au plus)
+    summaries = {name: _volume_summary(volume) for name, volume in volumes.items()}
+    
+    per_volume = {}
+    for name, volume in volumes.items():
+        summary = summaries[name]
+        p1, p99 = volume_percentiles(volume, [1, 99])
+        per_volume[name] = VolStats(summary['min'], summary['max'], summary['mean'],
+                                    summary['std'], p1, p99)
+    stats = IntensityStats(**per_volume)
     
     # Si un deuxième volume est fourni
     if volume2 is not None:
-        stats['volume2'] = {
-            'min': float(volume2.min()),
-            'max': float(volume2.max()),
-            'mean': float(volume2.mean()),
-            'std': float(volume2.std()),
-            'percentile_1': float(np.percentile(volume2, 1)),
-            'percentile_99': float(np.percentile(volume2, 99))
-        }
+        # Statistiques combinées pour les niveaux d'affichage, sur les voxels > 0 :
+        # histogrammes ramenés sur une plage commune et additionnés, les voxels
+        # <= 0 occupant les premiers rangs de l'ordre trié
+        lo = min(summary['min'] for summary in summaries.values())
+        hi = max(summary['max'] for summary in summaries.values())
+        total = volume1.size + volume2.size
+        positives = sum(summary['positives'] for summary in summaries.values())
         
-        # Statistiques combinées pour les niveaux d'affichage
-        combined = np.concatenate([volume1.flatten(), volume2.flatten()])
-        non_zero = combined[combined > 0]
-        
-        if len(non_zero) > 0:
-            stats['combined'] = {
-                'min_intensity': float(np.percentile(non_zero, 1)),
-                'max_intensity': float(np.percentile(non_zero, 99)),
-            }
+        if positives > 0 and hi > lo:
+            combined = sum(_rebin_histogram(summary['histogram'], summary['min'], summary['max'], lo, hi)
+                           for summary in summaries.values())
+            offset = total - positives
+            p1, p99 = _histogram_quantiles(combined, lo, hi,
+                                           [offset + 0.01 * (positives - 1),
+                                            offset + 0.99 * (positives - 1)])
+            stats.min_intensity = max(p1, 0.0)
+            stats.max_intensity = p99
         else:
-            stats['combined'] = {
-                'min_intensity': float(combined.min()),
-                'max_intensity': float(combined.max()),
-            }
+            stats.min_intensity = lo
+            stats.max_intensity = hi
             
         # Calcul de window/level pour l'affichage
-        window = stats['combined']['max_intensity'] - stats['combined']['min_intensity']
-        level = (stats['combined']['max_intensity'] + stats['combined']['min_intensity']) / 2
-        
-        stats['display'] = {
-            'window': window,
-            'level': level
-        }
+        stats.window = stats.max_intensity - stats.min_intensity
+        stats.level = (stats.max_intensity + stats.min_intensity) / 2
     
     return stats
 
@@ -334,23 +815,23 @@ def print_intensity_stats(stats):
     Affiche les statistiques d'intensité de manière formatée.
     
     Args:
-        stats (dict): Statistiques retournées par calculate_intensity_stats
+        stats (IntensityStats): Statistiques retournées par calculate_intensity_stats
     """
     print("\n=== Statistiques d'Intensité ===")
     
-    for volume_name, volume_stats in stats.items():
-        if volume_name in ['volume1', 'volume2']:
+    for volume_name, volume_stats in (('volume1', stats.volume1), ('volume2', stats.volume2)):
+        if volume_stats is not None:
             print(f"\n{volume_name.upper()}:")
-            print(f"  Min: {volume_stats['min']:.2f}")
-            print(f"  Max: {volume_stats['max']:.2f}")
-            print(f"  Moyenne: {volume_stats['mean']:.2f}")
-            print(f"  Écart-type: {volume_stats['std']:.2f}")
-            print(f"  Percentiles 1-99%: {volume_stats['percentile_1']:.2f} - {volume_stats['percentile_99']:.2f}")
+            print(f"  Min: {volume_stats.mn:.2f}")
+            print(f"  Max: {volume_stats.mx:.2f}")
+            print(f"  Moyenne: {volume_stats.mean:.2f}")
+            print(f"  Écart-type: {volume_stats.std:.2f}")
+            print(f"  Percentiles 1-99%: {volume_stats.p1:.2f} - {volume_stats.p99:.2f}")
     
-    if 'display' in stats:
+    if stats.window is not None:
         print(f"\nPARAMÈTRES D'AFFICHAGE:")
-        print(f"  Window: {stats['display']['window']:.2f}")
-        print(f"  Level: {stats['display']['level']:.2f}")
+        print(f"  Window: {stats.window:.2f}")
+        print(f"  Level: {stats.level:.2f}")
 
 
 def compare_volumes(volume1, volume2, name1="Volume 1", name2="Volume 2"):
@@ -371,14 +852,29 @@ def compare_volumes(volume1, volume2, name1="Volume 1", name2="Volume 2"):
         return
     
     # Calcul des différences
-    diff = volume2 - volume1
-    abs_diff = np.abs(diff)
+    if numba is not None:
+        # Deux passes sur les deux volumes : moyennes et |b - a|, puis produits centrés
+        n = volume1.size
+        mean_a, mean_b, saa, sbb, sab, sad, mad = _compare_kernel(
+            np.ravel(volume1), np.ravel(volume2), numba.get_num_threads())
+        diff_mean = mean_b - mean_a
+        abs_diff_mean = sad / n
+        abs_diff_max = mad
+        denom = np.sqrt(saa * sbb)
+        correlation = sab / denom if denom > 0 else np.nan
+    else:
+        diff = volume2 - volume1
+        abs_diff = np.abs(diff)
+        diff_mean = diff.mean()
+        abs_diff_mean = abs_diff.mean()
+        abs_diff_max = abs_diff.max()
+        correlation = np.corrcoef(np.ravel(volume1), np.ravel(volume2))[0, 1]
     
     print(f"Forme identique: {volume1.shape}")
-    print(f"Différence moyenne: {diff.mean():.4f}")
-    print(f"Différence absolue moyenne: {abs_diff.mean():.4f}")
-    print(f"Différence max: {abs_diff.max():.4f}")
-    print(f"Corrélation: {np.corrcoef(volume1.flatten(), volume2.flatten())[0,1]:.4f}")
+    print(f"Différence moyenne: {diff_mean:.4f}")
+    print(f"Différence absolue moyenne: {abs_diff_mean:.4f}")
+    print(f"Différence max: {abs_diff_max:.4f}")
+    print(f"Corrélation: {correlation:.4f}")
 
 
 def check_volume_alignment(volume1, volume2, name1="Volume 1", name2="Volume 2"):
@@ -591,6 +1087,9 @@ def detect_volume_shifts(volume1, volume2, max_shift=10):
         center[2]-roi_size//2:center[2]+roi_size//2
     ]
     
+    if _gpu_available():
+        return _detect_volume_shifts_gpu(roi1, roi2, max_shift)
+    
     best_correlation = -1
     best_shift = (0, 0, 0)
     
@@ -611,6 +1110,52 @@ def detect_volume_shifts(volume1, volume2, max_shift=10):
     return best_shift
 
 
+def _detect_volume_shifts_gpu(roi1, roi2, max_shift):
+    """
+    Recherche exhaustive du décalage sur GPU (CuPy), équivalente à la boucle CPU.
+    
+    np.roll étant une permutation, l'écart-type du ROI décalé ne change pas :
+    la corrélation ne dépend que du produit scalaire avec roi1 centré.
+    Tous les décalages sont des vues (as_strided) sur roi2 paddé en mode
+    'wrap', ce qui reproduit exactement np.roll sans copie par décalage.
+    
+    Args:
+        roi1, roi2 (numpy.ndarray): Régions d'intérêt de même forme
+        max_shift (int): Décalage maximum à tester en voxels
+        
+    Returns:
+        tuple: Décalages estimés (dx, dy, dz)
+    """
+    from cupy.lib.stride_tricks import as_strided
+    
+    g1 = cp.asarray(roi1, dtype=cp.float32)
+    g2 = cp.asarray(roi2, dtype=cp.float32)
+    if float(g1.std()) == 0 or float(g2.std()) == 0:
+        return (0, 0, 0)
+    g1 -= g1.mean()
+    g2 -= g2.mean()
+    
+    # padded[k:k+n] == np.roll(roi2, max_shift - k) sur chaque axe
+    padded = cp.pad(g2, max_shift, mode='wrap')
+    n0, n1, n2 = g2.shape
+    s0, s1, s2 = padded.strides
+    steps = max_shift + 1  # len(range(-max_shift, max_shift + 1, 2))
+    
+    # Un lot de (steps x steps) décalages (dy, dz) par décalage dx
+    scores = cp.empty((steps, steps, steps), dtype=cp.float32)
+    for jx in range(steps):
+        slab = padded[2*jx:2*jx + n0]
+        shifted = as_strided(slab, shape=(steps, steps, n0, n1, n2),
+                             strides=(2*s1, 2*s2, s0, s1, s2))
+        scores[jx] = cp.tensordot(shifted, g1, axes=3)
+    
+    # Index j <-> décalage max_shift - 2j : on retourne les axes pour
+    # retrouver l'ordre croissant (et le départage) de la boucle CPU
+    scores = scores[::-1, ::-1, ::-1]
+    best = cp.unravel_index(int(cp.argmax(scores)), scores.shape)
+    return tuple(int(i) * 2 - max_shift for i in best)
+
+
 def generate_alignment_recommendations(alignment_info):
     """
     Génère des recommandations basées sur l'analyse d'alignement.
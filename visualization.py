@@ -12,19 +12,126 @@ Fonctions:
     - show_interactive_comparison: Fonction de convenance pour l'affichage
 """
 
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
 import vtk
 import numpy as np
 from vtk.util import numpy_support
 
 # Gestion des imports relatifs/absolus pour compatibilité
 try:
-    from .converters import simple_numpy_to_vtk
     from .utils import calculate_intensity_stats, print_intensity_stats
 except ImportError:
     # Fallback pour exécution directe
-    from converters import simple_numpy_to_vtk
     from utils import calculate_intensity_stats, print_intensity_stats
 
+# Intervalle minimal (s) entre deux affichages de position (~20 Hz) : la
+# répétition des touches ne doit pas être freinée par les écritures stdout
+_POSITION_PRINT_INTERVAL = 0.05
+
+# Nombre (approximatif) de coupes axiales échantillonnées pour les statistiques
+# d'intensité des volumes en mémoire projetée
+_MMAP_STATS_SLICES = 64
+
+# Nombre de coupes calculées (coupes épaisses, coupes converties en mémoire
+# projetée) gardées en cache : les allers-retours rapides ne les recalculent pas
+_SLICE_CACHE_SIZE = 32
+
+# Épaisseur (en coupes) du mode coupe épaisse, centrée sur la coupe courante
+_SLAB_THICKNESS = 5
+
+
+def _oriented_copies(volume):
+    """
+    Copies contiguës d'un volume (Z, Y, X) par orientation, indexées par
+    la position de coupe : [axial][z], [coronal][y], [sagittal][x].
+    
+    Chaque coupe est ainsi une vue contiguë, au prix de 2 copies du volume.
+    Les coupes coronales et sagittales ont l'axe Z inversé (tête en haut de
+    l'écran), comme l'affichage 2D de VTK où la première ligne est en bas.
+    """
+    return [
+        volume,                                                         # axial    : volume[z, :, :]
+        np.ascontiguousarray(volume.transpose(1, 0, 2)[:, ::-1, :]),    # coronal  : volume[::-1, y, :]
+        np.ascontiguousarray(volume.transpose(2, 0, 1)[:, ::-1, :]),    # sagittal : volume[::-1, :, x]
+    ]
+
+
+def _oriented_views(volume):
+    """
+    Équivalent de _oriented_copies sans copie (vues transposées) : pour les
+    volumes en mémoire projetée, seules les pages de la coupe affichée sont lues.
+    """
+    return [
+        volume,
+        volume.transpose(1, 0, 2)[:, ::-1, :],
+        volume.transpose(2, 0, 1)[:, ::-1, :],
+    ]
+
+
+def _is_binary(volume):
+    """Indique si un volume ne contient que des 0 et des 1 (les deux présents), sans tri."""
+    if volume.min() != 0 or volume.max() != 1:
+        return False
+    # Bornes 0 et 1 : binaire si toutes les valeurs non nulles valent 1
+    return np.count_nonzero(volume) == np.count_nonzero(volume == 1)
+
+
+def _slice_correlation(slice1, slice2):
+    """
+    Moyennes et corrélation de Pearson de deux tranches de même forme.
+    
+    Les moyennes servent au centrage puis sont renvoyées, sans passe
+    supplémentaire ; les produits scalaires (BLAS) portent sur les écarts
+    centrés de vues ravel (tranches contiguës, sans copie).
+    
+    Returns:
+        tuple: (moyenne 1, moyenne 2, corrélation) ; corrélation 0 si une
+            tranche est (quasi) constante
+    """
+    a = slice1.ravel()
+    b = slice2.ravel()
+    n = a.size
+    mean_a = a.mean(dtype=np.float64)
+    mean_b = b.mean(dtype=np.float64)
+    da = np.subtract(a, mean_a, dtype=np.float64)
+    db = np.subtract(b, mean_b, dtype=np.float64)
+    ss_a = da @ da
+    ss_b = db @ db
+    # Tranche (quasi) constante : écart-type sous la précision float32
+    if ss_a <= 1e-12 * n * mean_a * mean_a or ss_b <= 1e-12 * n * mean_b * mean_b:
+        return float(mean_a), float(mean_b), 0.0
+    return float(mean_a), float(mean_b), float((da @ db) / np.sqrt(ss_a * ss_b))
+
+
+def _bind_slice(image, scalars, slice_2d):
+    """
+    Fait pointer le tableau de scalaires persistant d'une image VTK 2D sur
+    une coupe float32 contiguë, sans copie ni allocation VTK.
+    """
+    # save=1 : VTK ne libère pas la mémoire, qui reste détenue par NumPy
+    scalars.SetVoidArray(slice_2d, slice_2d.size, 1)
+    scalars.Modified()
+    image.Modified()
+
+
+@dataclass(slots=True)
+class SliceView:
+    """Une des 6 vues du visualiseur : coupe affichée, acteur et renderer."""
+    image: vtk.vtkImageData   # coupe 2D partageant le buffer de la coupe NumPy
+    scalars: vtk.vtkFloatArray   # scalaires de l'image, repointés à chaque coupe
+    window_level: vtk.vtkImageMapToWindowLevelColors   # float32 -> luminance uint8
+    actor: vtk.vtkImageSlice
+    renderer: vtk.vtkRenderer
+    orient_idx: int   # 0 : axial, 1 : coronal, 2 : sagittal
+    vol_idx: int      # 0 : volume 1, 1 : volume 2
+    source: list      # copies orientées du volume affiché (cf. _oriented_copies)
+    current: np.ndarray | None = None  # coupe référencée par VTK, gardée en vie ici
+    difference: bool = False           # affiche |V2 - V1| au lieu de la source (mode 'd')
+
 
 class InteractiveImageViewer:
     """
@@ -34,41 +141,73 @@ class InteractiveImageViewer:
     avec affichage côte-à-côte des deux volumes.
     """
     
-    def __init__(self, volume1, volume2):
+    def __init__(self, volume1, volume2, mmap_path=None):
         """
         Initialise le visualiseur avec deux volumes.
         
         Args:
             volume1, volume2 (numpy.ndarray): Volumes 3D à comparer
+            mmap_path (tuple, optional): Chemins de deux fichiers .npy ouverts en
+                mémoire projetée à la place de volume1/volume2 (qui peuvent alors
+                valoir None). Aucune copie des volumes n'est faite : seules les
+                pages des coupes affichées sont lues, et les statistiques
+                d'intensité sont estimées sur un sous-ensemble de coupes
         """
-        self.volume1 = volume1
-        self.volume2 = volume2
-        self.shape = volume1.shape
-        
-        # Calculer les niveaux d'intensité automatiquement
-        self.calculate_intensity_levels()
-        
-        # Position actuelle des coupes
-        self.axial_slice = 50 # A la mano
-        self.coronal_slice = 70 # A la mano
-        self.sagittal_slice = 85 # A la mano
-        
-        # Conversion en VTK - utiliser la version simplifiée pour débugger
-        self.vtk_volume1 = simple_numpy_to_vtk(volume1)
-        self.vtk_volume2 = simple_numpy_to_vtk(volume2)
+        self.mmap = mmap_path is not None
+        if self.mmap:
+            self.volume1, self.volume2 = (np.load(path, mmap_mode='r') for path in mmap_path)
+        else:
+            # Volumes float32 C-contigus, convertis une seule fois et partagés par
+            # toutes les opérations (VTK, différence, corrélations, statistiques)
+            self.volume1 = np.ascontiguousarray(volume1, dtype=np.float32)
+            self.volume2 = np.ascontiguousarray(volume2, dtype=np.float32)
+        self.shape = self.volume1.shape
+        
+        # Position actuelle des coupes, bornées aux dimensions (indices NumPy)
+        self.axial_slice = min(50, self.shape[0] - 1) # A la mano
+        self.coronal_slice = min(70, self.shape[1] - 1) # A la mano
+        self.sagittal_slice = min(85, self.shape[2] - 1) # A la mano
+        self._last_position_print = 0.0
+        
+        # Mode coupe épaisse : 1 = coupe simple. Sommes cumulées par copie
+        # orientée (id de l'array -> cumul), construites au premier besoin
+        self.slab_thickness = 1
+        self._slab_cumsums = {}
+        
+        # Cache LRU des coupes calculées : (type, id de l'array source, position, ...) -> coupe
+        self._slice_cache = OrderedDict()
         
         # Initialisation des composants VTK
-        self.reslice_cursors = []
-        self.image_actors = []
         self.renderers = []
+        self.views = []
+        
+        # Les copies orientées (copies NumPy, hors GIL) sont construites en
+        # tâche de fond pendant le calcul des niveaux et la création de l'interface
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            orient = _oriented_views if self.mmap else _oriented_copies
+            oriented_futures = [executor.submit(orient, volume)
+                                for volume in (self.volume1, self.volume2)]
+            
+            # Calculer les niveaux d'intensité automatiquement
+            self.calculate_intensity_levels()
+            
+            self.setup_gui()
+            
+            # Coupes dans les 3 orientations : [vol_idx][orient_idx][position]
+            self.oriented_volumes = [future.result() for future in oriented_futures]
         
-        self.setup_gui()
         self.setup_pipeline()
     
     def calculate_intensity_levels(self):
         """Calcule automatiquement les niveaux d'intensité optimaux"""
+        volume1, volume2 = self.volume1, self.volume2
+        if self.mmap:
+            # Échantillon de coupes axiales : évite de lire tout le fichier
+            step = max(1, self.shape[0] // _MMAP_STATS_SLICES)
+            volume1, volume2 = volume1[::step], volume2[::step]
+        
         # Cas particulier : segmentation binaire
-        if np.array_equal(np.unique(self.volume1), [0, 1]) and np.array_equal(np.unique(self.volume2), [0, 1]):
+        if _is_binary(volume1) and _is_binary(volume2):
             self.min_intensity = 0
             self.max_intensity = 1
             self.window  = 1
@@ -76,16 +215,16 @@ class InteractiveImageViewer:
             print("Niveaux d'intensité (binaire) définis : Window = 1, Level = 0.5")
             return
 
-        stats = calculate_intensity_stats(self.volume1, self.volume2)
+        stats = calculate_intensity_stats(volume1, volume2)
         
-        if 'display' in stats:
-            self.window = stats['display']['window']
-            self.level = stats['display']['level']
-            self.min_intensity = stats['combined']['min_intensity']
-            self.max_intensity = stats['combined']['max_intensity']
+        if stats.window is not None:
+            self.window = stats.window
+            self.level = stats.level
+            self.min_intensity = stats.min_intensity
+            self.max_intensity = stats.max_intensity
         else:
-            self.min_intensity = stats['volume1']['percentile_1']
-            self.max_intensity = stats['volume1']['percentile_99']
+            self.min_intensity = stats.volume1.p1
+            self.max_intensity = stats.volume1.p99
             self.window = self.max_intensity - self.min_intensity
             self.level = (self.max_intensity + self.min_intensity) / 2
         
@@ -137,10 +276,6 @@ class InteractiveImageViewer:
             self.renderers.append(renderer)
             self.render_window.AddRenderer(renderer)
         
-        # Réinitialiser les caméras après avoir ajouté tous les renderers
-        for renderer in self.renderers:
-            renderer.ResetCamera()
-        
         # Gestionnaire d'événements clavier et fermeture
         self.interactor.AddObserver("KeyPressEvent", self.on_key_press)
         self.interactor.AddObserver("ExitEvent", self.on_exit)
@@ -151,76 +286,182 @@ class InteractiveImageViewer:
     
     def setup_pipeline(self):
         """Configure le pipeline de rendu VTK"""
-        # Configuration pour les 6 vues (3 orientations x 2 volumes)
-        orientations = ['axial', 'coronal', 'sagittal']
-        volumes = [self.vtk_volume1, self.vtk_volume2]
-        
-        for vol_idx, volume in enumerate(volumes):
-            for orient_idx, orientation in enumerate(orientations):
-                # Reslice pour extraire la coupe
-                reslice = vtk.vtkImageReslice()
-                reslice.SetInputData(volume)
-                reslice.SetInterpolationModeToLinear()
-                reslice.SetOutputDimensionality(2)
+        # Configuration pour les 6 vues (3 orientations x 2 volumes). Les vues
+        # étant alignées sur les axes, chaque coupe est une vue NumPy contiguë
+        # des copies orientées, exposée à VTK sans copie ni rééchantillonnage
+        for vol_idx, source in enumerate(self.oriented_volumes):
+            for orient_idx in range(3):
+                # Image 2D aux dimensions fixes de l'orientation, dont les
+                # scalaires pointent sur la coupe courante (cf. _bind_slice)
+                height, width = source[orient_idx].shape[1:]
+                image = vtk.vtkImageData()
+                image.SetDimensions(width, height, 1)
+                scalars = vtk.vtkFloatArray()
+                image.GetPointData().SetScalars(scalars)
                 
-                # Configuration de l'orientation
-                if orientation == 'axial':
-                    reslice.SetResliceAxesDirectionCosines(1,0,0, 0,1,0, 0,0,1)
-                elif orientation == 'coronal':
-                    reslice.SetResliceAxesDirectionCosines(1,0,0, 0,0,-1, 0,1,0)
-                else:  # sagittal
-                    reslice.SetResliceAxesDirectionCosines(0,1,0, 0,0,-1, 1,0,0)
+                # Window/level appliqué une fois en amont : le mapper reçoit une
+                # luminance uint8 (texture 4x plus petite que le float32)
+                window_level = vtk.vtkImageMapToWindowLevelColors()
+                window_level.SetInputData(image)
+                window_level.SetWindow(self.window)
+                window_level.SetLevel(self.level)
+                window_level.SetOutputFormatToLuminance()
                 
                 # Mapper pour convertir l'image en rendu 2D
                 mapper = vtk.vtkImageSliceMapper()
-                mapper.SetInputConnection(reslice.GetOutputPort())
+                mapper.SetInputConnection(window_level.GetOutputPort())
                 
                 # Actor pour afficher l'image
                 actor = vtk.vtkImageSlice()
                 actor.SetMapper(mapper)
                 
-                # Configuration des propriétés d'affichage
+                # Configuration des propriétés d'affichage (luminance 0-255 affichée telle quelle)
                 property = actor.GetProperty()
-                property.SetColorWindow(self.window)
-                property.SetColorLevel(self.level)
+                property.SetColorWindow(255)
+                property.SetColorLevel(127.5)
                 property.SetInterpolationTypeToLinear()
                 
-                # Ajouter à la liste
-                self.reslice_cursors.append(reslice)
-                self.image_actors.append(actor)
-                
                 # Ajouter l'actor au renderer correspondant
-                renderer_idx = vol_idx * 3 + orient_idx
-                self.renderers[renderer_idx].AddViewProp(actor)
+                renderer = self.renderers[vol_idx * 3 + orient_idx]
+                renderer.AddViewProp(actor)
+                
+                self.views.append(SliceView(image, scalars, window_level, actor, renderer, orient_idx, vol_idx, source))
         
+        self._update_fn = self._build_update_fn()
         self.update_slices()
+        self.reset_cameras()
     
-    def update_slices(self):
-        """Met à jour la position des coupes pour toutes les vues"""
-        orientations = ['axial', 'coronal', 'sagittal']
-        slices = [self.axial_slice, self.coronal_slice, self.sagittal_slice]
+    def set_window_level(self, window, level):
+        """Modifie window/level des 6 vues et met à jour l'affichage"""
+        self.window = window
+        self.level = level
+        for view in self.views:
+            view.window_level.SetWindow(window)
+            view.window_level.SetLevel(level)
+        self.render_window.Render()
+    
+    def reset_cameras(self):
+        """Recadre les caméras des 6 vues (à l'initialisation ou si les bornes changent)"""
+        for view in self.views:
+            view.renderer.ResetCamera()
+    
+    def _build_update_fn(self):
+        """
+        Construit la fonction de mise à jour des 6 vues.
         
-        for vol_idx in range(2):  # 2 volumes
-            for orient_idx, (orientation, slice_pos) in enumerate(zip(orientations, slices)):
-                reslice_idx = vol_idx * 3 + orient_idx
-                reslice = self.reslice_cursors[reslice_idx]
-                
-                # Position de la coupe selon l'orientation
-                if orientation == 'axial':
-                    reslice.SetResliceAxesOrigin(0, 0, slice_pos)
-                elif orientation == 'coronal':
-                    reslice.SetResliceAxesOrigin(0, slice_pos, 0)
-                else:  # sagittal
-                    reslice.SetResliceAxesOrigin(slice_pos, 0, 0)
-                
-                reslice.Update()
-                
-                # Réinitialiser la caméra pour chaque renderer
-                renderer = self.renderers[reslice_idx]
-                renderer.ResetCamera()
+        Les vues et la méthode de rendu sont résolues une seule fois et
+        capturées par la fermeture. Pas de ResetCamera() : les caméras ne
+        bougent pas avec la coupe.
+        """
+        views = tuple(self.views)
+        render = self.render_window.Render
+        
+        def update(*slices):
+            slab = self.slab_thickness > 1
+            for view in views:
+                pos = slices[view.orient_idx]
+                if view.difference:
+                    view.current = self._difference_slice(view.orient_idx, pos)
+                elif slab:
+                    view.current = self._slab_slice(view, pos)
+                else:
+                    view.current = self._display_slice(view, pos)
+                _bind_slice(view.image, view.scalars, view.current)
+            render()
         
-        if hasattr(self, 'render_window'):
-            self.render_window.Render()
+        return update
+    
+    def _slab_slice(self, view, pos):
+        """
+        Moyenne des slab_thickness coupes centrées sur pos (tronquée aux bords).
+        
+        La somme cumulée le long de l'axe de coupe est calculée une fois par
+        copie orientée : chaque moyenne coûte ensuite une soustraction de deux
+        coupes, quelle que soit l'épaisseur. En mémoire projetée, la moyenne
+        est calculée directement sur les coupes du slab : le cumul lirait
+        tout le fichier et occuperait un volume float32 complet en RAM.
+        """
+        volume = view.source[view.orient_idx]
+        half = self.slab_thickness // 2
+        k0 = max(pos - half, 0)
+        k1 = min(pos + half + 1, volume.shape[0])
+        key = ('slab', id(volume), pos, self.slab_thickness)
+        
+        if self.mmap:
+            def compute():
+                mean = volume[k0].astype(np.float32)
+                for k in range(k0 + 1, k1):
+                    mean += volume[k]
+                mean *= np.float32(1.0 / (k1 - k0))
+                return mean
+            return self._cached_slice(key, compute)
+        
+        cumsum = self._slab_cumsums.get(id(volume))
+        if cumsum is None:
+            # Cumul float32 : erreur négligeable après window/level sur 8 bits
+            cumsum = np.empty((volume.shape[0] + 1,) + volume.shape[1:], dtype=np.float32)
+            cumsum[0] = 0
+            np.cumsum(volume, axis=0, out=cumsum[1:])
+            self._slab_cumsums[id(volume)] = cumsum
+        
+        return self._cached_slice(key, lambda: (cumsum[k1] - cumsum[k0]) * np.float32(1.0 / (k1 - k0)))
+    
+    def _difference_slice(self, orient_idx, pos):
+        """
+        |V2 - V1| sur la coupe pos (moyenné sur l'épaisseur en mode coupe épaisse).
+        
+        Calculé à la demande à partir des coupes des deux volumes : le volume
+        de différence complet n'est jamais construit.
+        """
+        source1 = self.oriented_volumes[0][orient_idx]
+        source2 = self.oriented_volumes[1][orient_idx]
+        half = self.slab_thickness // 2
+        k0 = max(pos - half, 0)
+        k1 = min(pos + half + 1, source1.shape[0])
+        
+        def compute():
+            diff = np.abs(np.subtract(source2[k0], source1[k0], dtype=np.float32))
+            if k1 - k0 > 1:
+                for k in range(k0 + 1, k1):
+                    diff += np.abs(np.subtract(source2[k], source1[k], dtype=np.float32))
+                diff *= np.float32(1.0 / (k1 - k0))
+            return diff
+        
+        return self._cached_slice(('diff', orient_idx, pos, self.slab_thickness), compute)
+    
+    def _display_slice(self, view, pos):
+        """Coupe telle que VTK peut la référencer : float32 C-contiguë (copiée sinon)."""
+        volume = view.source[view.orient_idx]
+        slice_2d = volume[pos]
+        if slice_2d.dtype == np.float32 and slice_2d.flags.c_contiguous:
+            return slice_2d
+        return self._cached_slice(('copy', id(volume), pos),
+                                  lambda: np.ascontiguousarray(slice_2d, dtype=np.float32))
+    
+    def _cached_slice(self, key, compute):
+        """Coupe calculée par compute(), mémorisée dans le cache LRU des coupes."""
+        cache = self._slice_cache
+        slice_2d = cache.get(key)
+        if slice_2d is None:
+            slice_2d = compute()
+            cache[key] = slice_2d
+            if len(cache) > _SLICE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return slice_2d
+    
+    def toggle_slab_mode(self):
+        """Active/désactive l'affichage en coupe épaisse (moyenne de coupes voisines)"""
+        self.slab_thickness = _SLAB_THICKNESS if self.slab_thickness == 1 else 1
+        if self.slab_thickness > 1:
+            print(f"Mode coupe épaisse ACTIVÉ - Moyenne de {self.slab_thickness} coupes")
+        else:
+            print("Mode coupe épaisse DÉSACTIVÉ - Retour aux coupes simples")
+    
+    def update_slices(self):
+        """Met à jour la position des coupes pour toutes les vues"""
+        self._update_fn(self.axial_slice, self.coronal_slice, self.sagittal_slice)
     
     def on_key_press(self, obj, event):
         """Gestionnaire des événements clavier pour la navigation"""
@@ -251,6 +492,9 @@ class InteractiveImageViewer:
         elif key == 's':
             # Sauvegarder rapport d'alignement
             self.save_alignment_report()
+        elif key == 't':
+            # Toggle mode coupe épaisse
+            self.toggle_slab_mode()
         else:
             return
         
@@ -259,7 +503,11 @@ class InteractiveImageViewer:
             self.print_current_position()
     
     def print_current_position(self):
-        """Affiche la position actuelle des coupes"""
+        """Affiche la position actuelle des coupes (au plus une fois par intervalle)"""
+        now = time.perf_counter()
+        if now - self._last_position_print < _POSITION_PRINT_INTERVAL:
+            return
+        self._last_position_print = now
         print(f"Position: Axial={self.axial_slice}/{self.shape[0]-1}, "
               f"Coronal={self.coronal_slice}/{self.shape[1]-1}, "
               f"Sagittal={self.sagittal_slice}/{self.shape[2]-1}")
@@ -302,6 +550,7 @@ class InteractiveImageViewer:
         print("  ↑/↓ : Navigation axiale")
         print("  ←/→ : Navigation sagittale") 
         print("  Page Up/Down : Navigation coronale")
+        print(f"  't' : Activer/désactiver le mode coupe épaisse ({_SLAB_THICKNESS} coupes)")
         print("\nVÉRIFICATION D'ALIGNEMENT:")
         print("  'a' : Analyser l'alignement à la position actuelle")
         print("  'd' : Activer/désactiver le mode différence")
@@ -332,26 +581,15 @@ class InteractiveImageViewer:
         print(f"\n=== VÉRIFICATION D'ALIGNEMENT À LA POSITION ACTUELLE ===")
         print(f"Position: Axial={self.axial_slice}, Coronal={self.coronal_slice}, Sagittal={self.sagittal_slice}")
         
-        # Extraire les tranches actuelles
-        axial1 = self.volume1[self.axial_slice, :, :]
-        axial2 = self.volume2[self.axial_slice, :, :]
-        
-        coronal1 = self.volume1[:, self.coronal_slice, :]
-        coronal2 = self.volume2[:, self.coronal_slice, :]
-        
-        sagittal1 = self.volume1[:, :, self.sagittal_slice]
-        sagittal2 = self.volume2[:, :, self.sagittal_slice]
+        # Extraire les tranches actuelles (vues contiguës)
+        slices = (self.axial_slice, self.coronal_slice, self.sagittal_slice)
+        axial1, coronal1, sagittal1 = (vol[pos] for vol, pos in zip(self.oriented_volumes[0], slices))
+        axial2, coronal2, sagittal2 = (vol[pos] for vol, pos in zip(self.oriented_volumes[1], slices))
         
-        # Calculer les corrélations
-        def safe_correlation(slice1, slice2):
-            if np.std(slice1) > 0 and np.std(slice2) > 0:
-                corr = np.corrcoef(slice1.flatten(), slice2.flatten())[0, 1]
-                return corr if not np.isnan(corr) else 0.0
-            return 0.0
-        
-        corr_axial = safe_correlation(axial1, axial2)
-        corr_coronal = safe_correlation(coronal1, coronal2)
-        corr_sagittal = safe_correlation(sagittal1, sagittal2)
+        # Moyennes et corrélations, calculées ensemble par paire de tranches
+        mean1_axial, mean2_axial, corr_axial = _slice_correlation(axial1, axial2)
+        mean1_coronal, mean2_coronal, corr_coronal = _slice_correlation(coronal1, coronal2)
+        mean1_sagittal, mean2_sagittal, corr_sagittal = _slice_correlation(sagittal1, sagittal2)
         
         print(f"Corrélations:")
         print(f"  Axiale  : {corr_axial:.3f} {'✅' if corr_axial > 0.7 else '❌' if corr_axial < 0.5 else '⚠️'}")
@@ -360,8 +598,8 @@ class InteractiveImageViewer:
         
         # Moyennes d'intensité pour détecter des différences importantes
         print(f"Intensités moyennes:")
-        print(f"  Vol1 - Axiale: {axial1.mean():.1f}, Coronale: {coronal1.mean():.1f}, Sagittale: {sagittal1.mean():.1f}")
-        print(f"  Vol2 - Axiale: {axial2.mean():.1f}, Coronale: {coronal2.mean():.1f}, Sagittale: {sagittal2.mean():.1f}")
+        print(f"  Vol1 - Axiale: {mean1_axial:.1f}, Coronale: {mean1_coronal:.1f}, Sagittale: {mean1_sagittal:.1f}")
+        print(f"  Vol2 - Axiale: {mean2_axial:.1f}, Coronale: {mean2_coronal:.1f}, Sagittale: {mean2_sagittal:.1f}")
     
     def toggle_difference_mode(self):
         """Active/désactive l'affichage des différences"""
@@ -381,41 +619,16 @@ class InteractiveImageViewer:
     
     def setup_difference_pipeline(self):
         """Configure le pipeline pour afficher les différences"""
-        # Calculer le volume de différence seulement si ce n'est pas déjà fait
-        if not hasattr(self, 'vtk_diff'):
-            diff_volume = np.abs(self.volume2 - self.volume1)
-            self.vtk_diff = simple_numpy_to_vtk(diff_volume)
-        
-        # Reconfigurer les pipelines pour afficher les différences
-        orientations = ['axial', 'coronal', 'sagittal']
-        
-        for vol_idx in range(2):
-            for orient_idx, orientation in enumerate(orientations):
-                reslice_idx = vol_idx * 3 + orient_idx
-                reslice = self.reslice_cursors[reslice_idx]
-                
-                if vol_idx == 0:
-                    # Volume 1 normal
-                    reslice.SetInputData(self.vtk_volume1)
-                else:
-                    # Volume 2 remplacé par les différences
-                    reslice.SetInputData(self.vtk_diff)
-                
-                reslice.Update()
+        # Volume 1 normal, volume 2 remplacé par les différences, calculées
+        # coupe par coupe à l'affichage (cf. _difference_slice)
+        for view in self.views:
+            view.difference = view.vol_idx == 1
     
     def restore_normal_pipeline(self):
         """Restaure le pipeline normal (sans différences)"""
-        orientations = ['axial', 'coronal', 'sagittal']
-        volumes = [self.vtk_volume1, self.vtk_volume2]
-        
-        for vol_idx, volume in enumerate(volumes):
-            for orient_idx, orientation in enumerate(orientations):
-                reslice_idx = vol_idx * 3 + orient_idx
-                reslice = self.reslice_cursors[reslice_idx]
-                
-                # Restaurer le volume original
-                reslice.SetInputData(volume)
-                reslice.Update()
+        for view in self.views:
+            # Restaurer le volume original
+            view.difference = False
     
     def save_alignment_report(self):
         """Sauvegarde un rapport d'alignement dans un fichier"""
@@ -443,14 +656,16 @@ class InteractiveImageViewer:
             print(f"❌ Erreur lors de la sauvegarde: {e}")
             
 
-def show_interactive_comparison(volume1, volume2):
+def show_interactive_comparison(volume1, volume2, mmap_path=None):
     """
     Fonction de convenance pour afficher la comparaison interactive de deux volumes.
     
     Args:
         volume1, volume2 (numpy.ndarray): Volumes 3D à comparer
+        mmap_path (tuple, optional): Chemins .npy des deux volumes, ouverts en
+            mémoire projetée (cf. InteractiveImageViewer)
     """
-    viewer = InteractiveImageViewer(volume1, volume2)
+    viewer = InteractiveImageViewer(volume1, volume2, mmap_path=mmap_path)
     viewer.show()
 
 def show_3d_tumor_change(seg1_np, seg2_np, scan_np):
@@ -459,34 +674,49 @@ def show_3d_tumor_change(seg1_np, seg2_np, scan_np):
     """
     import vtk
 
+    # Conversions sans copie si l'array a déjà le bon dtype et est C-contigu :
+    # l'image VTK partage alors son buffer, référencé par l'image pour le garder en vie
     def numpy_to_vtk_mask(np_mask):
         dims = np_mask.shape[::-1]
         vtk_img = vtk.vtkImageData()
         vtk_img.SetDimensions(dims)
-        vtk_img.AllocateScalars(vtk.VTK_UNSIGNED_CHAR, 1)
-        flat = np_mask.astype(np.uint8).ravel(order='C')
-        vtk_arr = numpy_support.numpy_to_vtk(flat, deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+        flat = np.ascontiguousarray(np_mask, dtype=np.uint8).ravel(order='C')
+        vtk_arr = numpy_support.numpy_to_vtk(flat, deep=False, array_type=vtk.VTK_UNSIGNED_CHAR)
         vtk_img.GetPointData().SetScalars(vtk_arr)
+        vtk_img._np_ref = flat
         return vtk_img
 
     def numpy_to_vtk_image(np_img):
         dims = np_img.shape[::-1]
         vtk_img = vtk.vtkImageData()
         vtk_img.SetDimensions(dims)
-        vtk_img.AllocateScalars(vtk.VTK_FLOAT, 1)
-        flat = np_img.astype(np.float32).ravel(order='C')
-        vtk_arr = numpy_support.numpy_to_vtk(flat, deep=True, array_type=vtk.VTK_FLOAT)
+        flat = np.ascontiguousarray(np_img, dtype=np.float32).ravel(order='C')
+        vtk_arr = numpy_support.numpy_to_vtk(flat, deep=False, array_type=vtk.VTK_FLOAT)
         vtk_img.GetPointData().SetScalars(vtk_arr)
+        vtk_img._np_ref = flat
         return vtk_img
 
-    def make_surface(vtk_img, color, opacity=0.4):
-        contour = vtk.vtkMarchingCubes()
+    def make_surface(vtk_img, color, opacity=0.4, target_reduction=0.0):
+        # Flying Edges : même isosurface que Marching Cubes, en parallèle
+        contour = vtk.vtkFlyingEdges3D()
         contour.SetInputData(vtk_img)
         contour.SetValue(0, 0.5)
-        contour.Update()
+        output = contour
+        
+        # Décimation optionnelle (maillages translucides sans besoin de détail),
+        # puis recalcul des normales pour conserver l'ombrage de Phong
+        if target_reduction > 0:
+            decimate = vtk.vtkQuadricDecimation()
+            decimate.SetInputConnection(contour.GetOutputPort())
+            decimate.SetTargetReduction(target_reduction)
+            normals = vtk.vtkPolyDataNormals()
+            normals.SetInputConnection(decimate.GetOutputPort())
+            normals.SplittingOff()
+            output = normals
+        output.Update()
     
         mapper = vtk.vtkPolyDataMapper()
-        mapper.SetInputConnection(contour.GetOutputPort())
+        mapper.SetInputConnection(output.GetOutputPort())
         mapper.ScalarVisibilityOff()
     
         actor = vtk.vtkActor()
@@ -499,15 +729,17 @@ def show_3d_tumor_change(seg1_np, seg2_np, scan_np):
     # --- Génération de la surface du crâne ---
     # On suppose que les valeurs élevées correspondent à l'os (par exemple > 200)
     skull_threshold = 200  # À ajuster selon ton scanner
-    skull_mask = (scan_np > skull_threshold).astype(np.uint8)
+    # Seuillage écrit directement en uint8 (0/1), sans array booléen intermédiaire
+    skull_mask = np.empty(scan_np.shape, dtype=np.uint8)
+    np.greater(scan_np, skull_threshold, out=skull_mask.view(np.bool_))
     vtk_skull = numpy_to_vtk_mask(skull_mask)
     actor_skull = make_surface(vtk_skull, (0.8, 0.8, 0.8), 0.05)  # Gris translucide
 
     # --- Génération des surfaces des tumeurs ---
     vtk1 = numpy_to_vtk_mask(seg1_np)
     vtk2 = numpy_to_vtk_mask(seg2_np)
-    actor1 = make_surface(vtk1, (0, 0, 1), 0.7)  # Bleu
-    actor2 = make_surface(vtk2, (1, 0, 0), 0.7)  # Rouge
+    actor1 = make_surface(vtk1, (0, 0, 1), 0.7, target_reduction=0.7)  # Bleu
+    actor2 = make_surface(vtk2, (1, 0, 0), 0.7, target_reduction=0.7)  # Rouge
 
     # --- Affichage ---
     renderer = vtk.vtkRenderer()